@@ -1,32 +1,114 @@
+import os
+import numpy as np
 import pandas as pd
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from tkinter import messagebox
 import tkinter as tk
+from tkinter import ttk
 import calendar
+import threading
+
+try:
+    from python_calamine import CalamineError
+except ImportError:
+    CalamineError = None
+
+DATA_FILE = 'weather.xls'
+CACHE_FILE = 'weather.cache.parquet'
+TIME_COLUMN = 'Местное время в Шереметьево / им. А. С. Пушкина (аэропорт)'
+USED_COLUMNS = {TIME_COLUMN, 'T', 'P', 'WW', 'W1'}
+COLUMN_TYPES = {'T': 'float32', 'P': 'float32'}
+YEAR_RANGE = range(2005, 2025)
+SYNOPTIC_HOURS = frozenset({3, 6, 9, 12, 15, 18, 21})
+DAYS_IN_MONTH = {
+    (year, month): calendar.monthrange(year, month)[1]
+    for year in YEAR_RANGE
+    for month in range(1, 13)
+}
+
 
 class WeatherApp:
     """Главный класс приложения для анализа погодных данных.
 
     Attributes:
-        data (DataFrame): Загруженные и обработанные погодные данные.
+        data (DataFrame): Загруженные и обработанные погодные данные
+            или None, пока идет загрузка.
         root (Tk): Главное окно приложения.
         color (str): Основной цвет интерфейса.
         date (datetime): Выбранная пользователем дата для анализа.
         next_date (datetime): Ближайшая доступная дата в данных.
+        MONTHS (list): Значения выпадающего списка месяцев.
+        YEARS (list): Значения выпадающего списка лет.
     """
 
+    MONTHS = [f"{i:02d}" for i in range(1, 13)]
+    YEARS = [str(i) for i in YEAR_RANGE]
+
     def __init__(self, root):
         """Инициализирует приложение с главным окном.
 
         Args:
             root (Tk): Главное окно Tkinter.
         """
-        self.data = self._clean_data()
+        self.data = None
         self.root = root
         self.root.resizable(False, False)
         self.color = '#62639b'
+        self._avg_temp_fig = Figure(figsize=(9, 2))
+        self._avg_temp_ax = self._avg_temp_fig.add_subplot()
+        self._day_temp_fig = Figure(figsize=(9, 2))
+        self._day_temp_ax = self._day_temp_fig.add_subplot()
+        self._avg_temp_key = None
+        self._day_temp_key = None
         self._setup_main_window()
+        loader = threading.Thread(target=self._load_data_background)
+        loader.daemon = True
+        loader.start()
+
+    def _load_data_background(self):
+        """Загружает данные в фоновом потоке.
+
+        Note:
+            Главное окно уведомляется через root.after, поэтому виджеты
+            Tkinter изменяются только из основного потока.
+        """
+        try:
+            data = self._clean_data()
+            self._times = data.index.to_numpy()
+            self._compute_monthly_stats(data)
+        except Exception as e:
+            self._notify_main_thread(self._on_data_error, e)
+            return
+        self.data = data
+        self._notify_main_thread(self._on_data_ready)
+
+    def _notify_main_thread(self, callback, *args):
+        """Планирует вызов в основном потоке Tkinter.
+
+        Args:
+            callback (callable): Функция для вызова.
+            *args: Аргументы функции.
+
+        Note:
+            Если главное окно уже закрыто, вызов не планируется.
+        """
+        try:
+            self.root.after(0, callback, *args)
+        except (RuntimeError, tk.TclError):
+            pass
+
+    def _on_data_ready(self):
+        """Разблокирует кнопку ввода после загрузки данных."""
+        self.submit_btn.configure(state=tk.NORMAL)
+
+    def _on_data_error(self, error):
+        """Сообщает об ошибке загрузки данных.
+
+        Args:
+            error (Exception): Исключение, возникшее при загрузке.
+        """
+        messagebox.showerror('Ошибка', f"Не удалось загрузить данные: {error}")
 
     def _clean_data(self):
         """Загружает и подготавливает данные из файла.
@@ -35,19 +117,96 @@ class WeatherApp:
             DataFrame: Очищенные и подготовленные данные о погоде.
 
         Note:
-            Переименовывает столбец времени и преобразует его в datetime.
+            Читает только используемые столбцы, температуру и давление
+            хранит в float32. Переименовывает столбец времени, переводит
+            строки вида ДД.ММ.ГГГГ ЧЧ:ММ в ISO 8601 для быстрого разбора
+            в datetime и делает время отсортированным индексом таблицы.
+            Результат сохраняется в parquet-кэш, который используется,
+            пока он новее исходного xls-файла; поврежденный кэш
+            пропускается, и данные читаются из xls заново. Для разбора xls
+            используется движок calamine, если установлен пакет
+            python-calamine.
         """
-        data = pd.read_excel('weather.xls', skiprows=6)
-        data.rename(
-            columns={
-                'Местное время в Шереметьево / им. А. С. Пушкина (аэропорт)':
-                    'Time'
-            },
-            inplace=True
-        )
-        data['Time'] = pd.to_datetime(data['Time'], format='%d.%m.%Y %H:%M')
+        if (os.path.exists(CACHE_FILE) and
+                os.path.getmtime(CACHE_FILE) > os.path.getmtime(DATA_FILE)):
+            try:
+                return pd.read_parquet(CACHE_FILE).astype(COLUMN_TYPES)
+            except (ImportError, OSError, ValueError, KeyError):
+                pass
+
+        read_options = {
+            'skiprows': 6,
+            'usecols': lambda column: column in USED_COLUMNS,
+            'dtype': COLUMN_TYPES,
+        }
+        data = None
+        if CalamineError is not None:
+            try:
+                data = pd.read_excel(
+                    DATA_FILE, engine='calamine', **read_options
+                )
+            except (ImportError, CalamineError):
+                pass
+        if data is None:
+            data = pd.read_excel(DATA_FILE, **read_options)
+        data.rename(columns={TIME_COLUMN: 'Time'}, inplace=True)
+        time = data['Time']
+        iso_time = (time.str[6:10] + '-' + time.str[3:5] + '-' +
+                    time.str[:2] + 'T' + time.str[11:16])
+        data['Time'] = pd.to_datetime(iso_time, format='ISO8601', cache=True)
+        data = data.sort_values('Time').set_index('Time')
+        self._write_cache(data)
         return data
 
+    def _write_cache(self, data):
+        """Сохраняет подготовленные данные в parquet-кэш.
+
+        Args:
+            data (DataFrame): Подготовленные данные о погоде.
+
+        Note:
+            Данные пишутся во временный файл, который затем атомарно
+            заменяет кэш, поэтому прерванная запись не портит его.
+            Ошибки записи игнорируются: кэш лишь ускоряет запуск.
+        """
+        temp_file = CACHE_FILE + '.tmp'
+        try:
+            data.to_parquet(temp_file)
+            os.replace(temp_file, CACHE_FILE)
+        except (ImportError, OSError, ValueError):
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+
+    def _compute_monthly_stats(self, data):
+        """Заранее вычисляет помесячную статистику по всем данным.
+
+        Args:
+            data (DataFrame): Подготовленные данные о погоде.
+
+        Note:
+            Сохраняет средние дневные температуры, дни с максимальной средней
+            температурой месяца и наблюдения с минимальным давлением
+            месяца. Все ряды индексированы по времени, поэтому данные
+            за месяц выбираются срезом по строке вида ГГГГ-ММ.
+            Средние считаются по показаниям float64 в порядке исходного
+            листа (от новых наблюдений к старым), чтобы округление в
+            подписях совпадало с прежним расчетом по всей таблице.
+        """
+        temps = data['T'].astype('float64').round(1)[::-1]
+        self._daily_avg = temps.groupby(temps.index.floor('D')).mean()
+
+        daily_avg = self._daily_avg
+        day_months = [daily_avg.index.year, daily_avg.index.month]
+        max_temp = daily_avg.groupby(day_months).transform('max')
+        is_max = np.isclose(daily_avg.to_numpy(), max_temp.to_numpy())
+        self._max_temp_days = daily_avg[is_max]
+
+        months = [data.index.year, data.index.month]
+        min_press = data['P'].groupby(months).transform('min')
+        self._min_press_times = data['P'][data['P'] == min_press]
+
     def _setup_main_window(self):
         """Настраивает интерфейс главного окна ввода данных.
 
@@ -58,22 +217,31 @@ class WeatherApp:
         """
         self.root.title('Погода в Шереметьево')
 
-        months = [f"{i:02d}" for i in range(1, 13)]
+        style = ttk.Style(self.root)
+        style.map('TCombobox', fieldbackground=[('readonly', self.color)])
+
         month_label = tk.Label(self.root, text='Месяц')
         month_label.grid(row=0, column=1)
         self.months_var = tk.StringVar()
-        months_menu = tk.OptionMenu(self.root, self.months_var, *months)
-        months_menu.configure(bg=self.color, width=3)
-        months_menu['menu'].configure(bg=self.color)
+        months_menu = ttk.Combobox(
+            self.root,
+            textvariable=self.months_var,
+            values=self.MONTHS,
+            state='readonly',
+            width=3
+        )
         months_menu.grid(row=1, column=1, padx=3)
 
-        years = [str(i) for i in range(2005, 2025)]
         year_label = tk.Label(self.root, text='Год', width=3)
         year_label.grid(row=0, column=2)
         self.years_var = tk.StringVar()
-        years_menu = tk.OptionMenu(self.root, self.years_var, *years)
-        years_menu.configure(bg=self.color, width=3)
-        years_menu['menu'].configure(bg=self.color)
+        years_menu = ttk.Combobox(
+            self.root,
+            textvariable=self.years_var,
+            values=self.YEARS,
+            state='readonly',
+            width=5
+        )
         years_menu.grid(row=1, column=2, padx=3)
 
         day_label = tk.Label(self.root, text='День')
@@ -90,14 +258,15 @@ class WeatherApp:
         self.minute_entry = tk.Entry(self.root, width=3, bg=self.color)
         self.minute_entry.grid(row=1, column=5)
 
-        submit_btn = tk.Button(
+        self.submit_btn = tk.Button(
             self.root,
             text='Ввод',
             command=self._validate_input,
             bg=self.color,
-            width=5
+            width=5,
+            state=tk.DISABLED
         )
-        submit_btn.grid(row=1, column=6, padx=3)
+        self.submit_btn.grid(row=1, column=6, padx=3)
 
         close_btn = tk.Button(
             self.root,
@@ -113,6 +282,10 @@ class WeatherApp:
         Raises:
             ValueError: Если какие-либо данные некорректны или отсутствуют.
         """
+        if self.data is None:
+            messagebox.showinfo('Загрузка', 'Данные еще загружаются')
+            return
+
         try:
             month = self._get_validated_month()
             year = self._get_validated_year()
@@ -175,7 +348,7 @@ class WeatherApp:
             raise ValueError("День должен содержать не более 2 цифр")
 
         day = int(day_str)
-        max_days = calendar.monthrange(year, month)[1]
+        max_days = DAYS_IN_MONTH[(year, month)]
         if day < 1 or day > max_days:
             raise ValueError(
                 f"При месяце {month:02d} день должен быть от 1 до {max_days}"
@@ -237,26 +410,24 @@ class WeatherApp:
         Raises:
             ValueError: Если данные для указанной даты отсутствуют.
         """
-        date_str = f"{day:02d}.{month:02d}.{year} {hour:02d}:{minute:02d}"
-        self.date = pd.to_datetime(date_str, format='%d.%m.%Y %H:%M')
-
-        filtered_data = self.data[
-            (self.data['Time'].dt.year == year) &
-            (self.data['Time'].dt.month == month)
-            ]
+        self.date = pd.Timestamp(
+            year=year, month=month, day=day, hour=hour, minute=minute
+        )
 
-        if filtered_data.empty:
+        month_start = np.datetime64(f"{year:04d}-{month:02d}")
+        month_bounds = [month_start, month_start + np.timedelta64(1, 'M')]
+        first_idx, end_idx = np.searchsorted(self._times, month_bounds)
+        if first_idx == end_idx:
             raise ValueError("Информация на данный месяц отсутствует")
 
-        next_data = self.data[self.data['Time'] >= self.date]
-        if not (self.date in self.data['Time'].values):
-            if next_data.empty:
-                raise ValueError("Приложение не прогноз погоды")
-            if len(next_data) == len(self.data):
-                raise ValueError("Доступны наблюдения с 1 февраля 2005 года")
+        date = self.date.to_datetime64()
+        next_idx = np.searchsorted(self._times, date)
+        if next_idx == len(self._times):
+            raise ValueError("Приложение не прогноз погоды")
+        if next_idx == 0 and self._times[0] != date:
+            raise ValueError("Доступны наблюдения с 1 февраля 2005 года")
 
-        self.next_date = pd.to_datetime(next_data.iloc[-1, 0],
-                                        format='%d.%m.%Y %H:%M')
+        self.next_date = pd.Timestamp(self._times[next_idx])
 
     def _show_results_window(self, year, month, day, hour, minute):
         """Создает и отображает окно с результатами анализа.
@@ -273,11 +444,14 @@ class WeatherApp:
         result_window.title('Результат')
         result_window.geometry('1500x600')
 
+        daily_avg = self._daily_avg.loc[f"{year:04d}-{month:02d}"]
+        day_data = self.data.loc[f"{year:04d}-{month:02d}-{day:02d}"]
+
         self._show_weather_info(result_window, year, month, day, hour, minute)
-        self._show_avg_temp_graph(result_window, year, month)
+        self._show_avg_temp_graph(result_window, daily_avg)
         self._show_max_temp_info(result_window, year, month)
         self._show_min_pressure_info(result_window, year, month)
-        self._show_day_temp_graph(result_window, year, month, day)
+        self._show_day_temp_graph(result_window, day_data, year, month, day)
 
         close_btn = tk.Button(
             result_window,
@@ -325,31 +499,30 @@ class WeatherApp:
         Returns:
             str: Описание погоды или сообщение об отсутствии данных.
         """
-        if hour in {3, 6, 9, 12, 15, 18, 21}:
-            time_str = f"{day:02d}.{month:02d}.{year} {hour:02d}:00"
-            exact_date = pd.to_datetime(time_str, format='%d.%m.%Y %H:%M')
-            weather = self.data.loc[self.data['Time'] == exact_date, 'WW']
-
-            if not weather.empty and not pd.isna(weather.iloc[0]):
-                return weather.iloc[0]
-
-        next_weather = self.data.loc[
-            self.data['Time'] == self.next_date,
-            'W1'
-        ]
-
-        if not next_weather.empty and not pd.isna(next_weather.iloc[0]):
-            return next_weather.iloc[0]
+        if hour in SYNOPTIC_HOURS:
+            if minute == 0:
+                exact_date = self.date
+            else:
+                exact_date = self.date.replace(minute=0)
+            try:
+                weather = self.data.at[exact_date, 'WW']
+            except KeyError:
+                weather = None
+            if not pd.isna(weather):
+                return weather
+
+        next_weather = self.data.at[self.next_date, 'W1']
+        if not pd.isna(next_weather):
+            return next_weather
 
         return "Нет информации о погоде"
 
-    def _show_avg_temp_graph(self, window, year, month):
+    def _show_avg_temp_graph(self, window, daily_avg):
         """Отображает график средней температуры за месяц.
 
         Args:
             window (Toplevel): Окно для отображения.
-            year (int): Год.
-            month (int): Месяц.
+            daily_avg (Series): Средние дневные температуры за месяц.
         """
         label = tk.Label(
             window,
@@ -358,30 +531,34 @@ class WeatherApp:
         )
         label.place(x=1000, y=50, anchor='center')
 
-        fig = self._create_avg_temp_figure(year, month)
+        fig = self._create_avg_temp_figure(daily_avg)
         canvas = FigureCanvasTkAgg(fig, master=window)
         canvas.draw()
         canvas.get_tk_widget().place(x=1000, y=175, anchor='center')
 
-    def _create_avg_temp_figure(self, year, month):
+    def _create_avg_temp_figure(self, daily_avg):
         """Создает график средней температуры за месяц.
 
         Args:
-            year (int): Год.
-            month (int): Месяц.
+            daily_avg (Series): Средние дневные температуры за месяц.
 
         Returns:
             Figure: Объект графика matplotlib.
+
+        Note:
+            Перерисовывает один и тот же объект Figure и пропускает
+            перерисовку, если график уже построен для этого месяца.
         """
-        filtered = self.data[
-            (self.data['Time'].dt.year == year) &
-            (self.data['Time'].dt.month == month)
-            ]
-        daily_avg = filtered.groupby(filtered['Time'].dt.date)['T'].mean()
-
-        fig, ax = plt.subplots(figsize=(9, 2))
-        days = daily_avg.index.astype(str).str[8:10]
+        fig, ax = self._avg_temp_fig, self._avg_temp_ax
+        key = (self.date.year, self.date.month)
+        if key == self._avg_temp_key:
+            return fig
+        self._avg_temp_key = key
+
+        ax.clear()
+        days = daily_avg.index.day.to_numpy()
         ax.plot(days, daily_avg.values, marker='o', color=self.color)
+        ax.set_xticks(days)
         ax.set_title(f"Средняя температура: {self.date.strftime('%B %Y')}")
         ax.set_xlabel("Дата")
         ax.set_ylabel("Температура (°C)")
@@ -427,14 +604,11 @@ class WeatherApp:
         Returns:
             tuple: (максимальная температура, список дней с этой температурой)
         """
-        filtered = self.data[
-            (self.data['Time'].dt.year == year) &
-            (self.data['Time'].dt.month == month)
-            ]
-        daily_avg = filtered.groupby(filtered['Time'].dt.date)['T'].mean()
-        max_temp = daily_avg.max()
-        max_days = daily_avg[daily_avg == max_temp].index
-        max_days_str = [day.strftime('%Y-%m-%d') for day in max_days]
+        max_days = self._month_slice(self._max_temp_days, year, month)
+        if max_days.empty:
+            return np.nan, []
+        max_temp = max_days.max()
+        max_days_str = [day.strftime('%Y-%m-%d') for day in max_days.index]
         return max_temp, max_days_str
 
     def _show_min_pressure_info(self, window, year, month):
@@ -456,7 +630,7 @@ class WeatherApp:
 
         press_label = tk.Label(
             window,
-            text=f'Минимальное давление: {min_press}'
+            text=f'Минимальное давление: {min_press:.1f}'
         )
         press_label.place(x=250, y=400, anchor='center')
 
@@ -476,19 +650,33 @@ class WeatherApp:
         Returns:
             tuple: (минимальное давление, список дней с этим давлением)
         """
-        filtered = self.data[
-            (self.data['Time'].dt.year == year) &
-            (self.data['Time'].dt.month == month)
-            ]
-        min_press = filtered['P'].min()
-        min_days = filtered.loc[filtered['P'] == min_press, 'Time']
-        return min_press, min_days
-
-    def _show_day_temp_graph(self, window, year, month, day):
+        min_times = self._month_slice(self._min_press_times, year, month)
+        if min_times.empty:
+            return np.nan, min_times.index
+        return min_times.iloc[0], min_times.index
+
+    def _month_slice(self, series, year, month):
+        """Возвращает часть ряда, относящуюся к указанному месяцу.
+
+        Args:
+            series (Series): Ряд, индексированный по времени.
+            year (int): Год.
+            month (int): Месяц.
+
+        Returns:
+            Series: Значения за месяц; пустой ряд, если их нет.
+        """
+        try:
+            return series.loc[f"{year:04d}-{month:02d}"]
+        except KeyError:
+            return series.iloc[:0]
+
+    def _show_day_temp_graph(self, window, day_data, year, month, day):
         """Отображает график температуры за указанный день.
 
         Args:
             window (Toplevel): Окно для отображения.
+            day_data (DataFrame): Наблюдения за выбранный день.
             year (int): Год.
             month (int): Месяц.
             day (int): День.
@@ -500,30 +688,35 @@ class WeatherApp:
         )
         label.place(x=1000, y=300, anchor='center')
 
-        fig = self._create_day_temp_figure(year, month, day)
+        fig = self._create_day_temp_figure(day_data, year, month, day)
         canvas = FigureCanvasTkAgg(fig, master=window)
         canvas.draw()
         canvas.get_tk_widget().place(x=1000, y=425, anchor='center')
 
-    def _create_day_temp_figure(self, year, month, day):
+    def _create_day_temp_figure(self, day_data, year, month, day):
         """Создает график температуры за указанный день.
 
         Args:
+            day_data (DataFrame): Наблюдения за выбранный день.
             year (int): Год.
             month (int): Месяц.
             day (int): День.
 
         Returns:
             Figure: Объект графика matplotlib.
+
+        Note:
+            Перерисовывает один и тот же объект Figure и пропускает
+            перерисовку, если график уже построен для этого дня.
         """
-        day_data = self.data[
-            (self.data['Time'].dt.year == year) &
-            (self.data['Time'].dt.month == month) &
-            (self.data['Time'].dt.day == day)
-            ]
-
-        fig, ax = plt.subplots(figsize=(9, 2))
-        hours = day_data['Time'].dt.hour
+        fig, ax = self._day_temp_fig, self._day_temp_ax
+        key = (year, month, day)
+        if key == self._day_temp_key:
+            return fig
+        self._day_temp_key = key
+
+        ax.clear()
+        hours = day_data.index.hour
         ax.plot(hours, day_data['T'], marker='o', color=self.color)
         ax.set_title(f"Температура {day:02d}.{month:02d}.{year}")
         ax.set_xlabel("Часы")